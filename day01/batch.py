@@ -0,0 +1,101 @@
+import numpy as np
+
+START_POSITION = 50
+DIAL_SIZE = 100
+
+
+def parse_instructions(data: bytes) -> np.ndarray:
+    """
+    Parse a whole rotation log (e.g. b"L68\\nR48\\n") into signed clicks,
+    negative for L and positive for R, without going through Python strings.
+    Clicks are int64, so a rotation can have at most 18 digits.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    is_left = buf == ord("L")
+    is_right = buf == ord("R")
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    is_space = np.isin(buf, np.frombuffer(b" \t\r\n", dtype=np.uint8))
+    if not np.all(is_left | is_right | is_digit | is_space):
+        raise ValueError
+    directions = np.flatnonzero(is_left | is_right)
+
+    # Each instruction is a direction immediately followed by a run of digits.
+    padded = np.concatenate(([False], is_digit, [False]))
+    run_starts = np.flatnonzero(~padded[:-1] & padded[1:])
+    run_ends = np.flatnonzero(padded[:-1] & ~padded[1:])
+    if len(run_starts) != len(directions) or np.any(run_starts != directions + 1):
+        raise ValueError
+
+    digit_positions = np.flatnonzero(is_digit)
+    run_lengths = run_ends - run_starts
+    if len(run_lengths) and run_lengths.max() > 18:
+        raise ValueError("Rotations of more than 18 digits overflow int64.")
+    run_ids = np.repeat(np.arange(len(run_starts)), run_lengths)
+    powers = run_ends[run_ids] - 1 - digit_positions
+    contributions = (buf[digit_positions] - ord("0")).astype(np.int64) * (
+        np.int64(10) ** powers
+    )
+    if not len(run_lengths):
+        return np.zeros(0, dtype=np.int64)
+    clicks = np.add.reduceat(contributions, np.cumsum(run_lengths) - run_lengths)
+    if np.any(clicks == 0):
+        raise ValueError
+    return np.where(is_left[directions], -clicks, clicks)
+
+
+def count_zeros(
+    moves: np.ndarray, position: int = START_POSITION
+) -> tuple[int, int, int]:
+    """
+    Returns (part 1 zeros, part 2 zeros, final position), matching Dial.move
+    and DialP2.move respectively.
+
+    DialP2.move adds |new // 100 - old // 100| with old in [0, 100). Writing
+    the unwrapped position as S = position + cumsum(moves), that is exactly
+    |S_i // 100 - S_{i-1} // 100|, so both parts only need one cumulative sum.
+    That sum is int64 too: it is exact as long as the unwrapped position stays
+    within +-2**63.
+    """
+    unwrapped = np.empty(len(moves) + 1, dtype=np.int64)
+    unwrapped[0] = position
+    np.cumsum(moves, dtype=np.int64, out=unwrapped[1:])
+    unwrapped[1:] += position
+    landed = int(np.count_nonzero(unwrapped[1:] % DIAL_SIZE == 0))
+    crossed = int(np.abs(np.diff(unwrapped // DIAL_SIZE)).sum())
+    return landed, crossed, int(unwrapped[-1] % DIAL_SIZE)
+
+
+def count_zeros_from_file(path) -> tuple[int, int, int]:
+    with open(path, "rb") as f:
+        return count_zeros(parse_instructions(f.read()))
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from d1 import Dial, DialP2
+
+    landed, crossed, _ = count_zeros_from_file(Path(__file__).parent / "input.txt")
+    print(landed)
+    print(crossed)
+
+    rng = np.random.default_rng(0)
+    n_instructions = 1_000_000
+    signs = rng.choice([b"L", b"R"], size=n_instructions)
+    clicks = rng.integers(1, 1000, size=n_instructions)
+    data = b"\n".join(s + str(c).encode() for s, c in zip(signs, clicks))
+
+    start = perf_counter()
+    instructions = data.decode().split("\n")
+    dial = Dial()
+    dial2 = DialP2()
+    for instruction in instructions:
+        dial.move(instruction)
+        dial2.move(instruction)
+    print(f"Per line: elapsed {perf_counter() - start:2.4f} seconds.")
+
+    start = perf_counter()
+    landed, crossed, position = count_zeros(parse_instructions(data))
+    print(f"Batch: elapsed {perf_counter() - start:2.4f} seconds.")
+    assert (landed, crossed, position) == (dial.zeros, dial2.zeros, dial2.position)
@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from d1 import Dial
+
+DIAL_SIZE = 100
+
+# (net offset modulo DIAL_SIZE, DialP2 zeros for every starting position)
+ChunkSummary = tuple[int, list[int]]
+
+
+def summarize_chunk(instructions: list[str]) -> ChunkSummary:
+    """
+    Runs DialP2.move for all 100 starting positions at once.
+
+    A move of d clicks from old position q adds |d| // 100 zeros regardless of
+    q, plus one more when q lies in a cyclic window that depends only on d % 100
+    (R: q >= 100 - d % 100, L: q < -d % 100). As q = (start + offset) % 100,
+    that window is a cyclic range of starting positions, so every move is an
+    O(1) update on a difference array.
+    """
+    offset = 0
+    base = 0
+    window_counts = [0] * (DIAL_SIZE + 1)
+    for instruction in instructions:
+        sign, clicks = Dial.parse_instruction(instruction)
+        base += clicks // DIAL_SIZE
+        remainder = clicks % DIAL_SIZE
+        if remainder:
+            q_low = DIAL_SIZE - remainder if sign > 0 else 0
+            low = (q_low - offset) % DIAL_SIZE
+            high = low + remainder
+            window_counts[low] += 1
+            if high <= DIAL_SIZE:
+                window_counts[high] -= 1
+            else:
+                window_counts[DIAL_SIZE] -= 1
+                window_counts[0] += 1
+                window_counts[high - DIAL_SIZE] -= 1
+        offset = (offset + sign * clicks) % DIAL_SIZE
+    zeros = []
+    running = base
+    for count in window_counts[:DIAL_SIZE]:
+        running += count
+        zeros.append(running)
+    return offset, zeros
+
+
+def combine(summaries: list[ChunkSummary], position: int = 50) -> tuple[int, int]:
+    """
+    Chains chunk summaries in order, returning (zeros, final position).
+    """
+    zeros = 0
+    for offset, chunk_zeros in summaries:
+        zeros += chunk_zeros[position]
+        position = (position + offset) % DIAL_SIZE
+    return zeros, position
+
+
+def chunk_boundaries(path, n_chunks: int) -> list[tuple[int, int]]:
+    """
+    Splits the file in byte ranges of roughly equal size ending on a newline.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, n_chunks):
+            f.seek(max(size * i // n_chunks, boundaries[-1]))
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(s, e) for s, e in zip(boundaries[:-1], boundaries[1:]) if s < e]
+
+
+def _summarize_file_chunk(path, start: int, end: int) -> ChunkSummary:
+    with open(path, "rb") as f:
+        f.seek(start)
+        instructions = f.read(end - start).decode().split()
+    return summarize_chunk(instructions)
+
+
+def count_zeros_parallel(
+    path, n_chunks: int | None = None, max_workers: int | None = None
+) -> tuple[int, int]:
+    n_chunks = n_chunks or os.cpu_count() or 1
+    boundaries = chunk_boundaries(path, n_chunks)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = executor.map(
+            _summarize_file_chunk,
+            [path] * len(boundaries),
+            *zip(*boundaries),
+        )
+        return combine(list(summaries))
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    from pathlib import Path
+    from time import perf_counter
+
+    from d1 import DialP2
+
+    zeros, _ = count_zeros_parallel(Path(__file__).parent / "input.txt")
+    print(zeros)
+
+    random.seed(0)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        for _ in range(2_000_000):
+            f.write(f"{random.choice('LR')}{random.randint(1, 999)}\n")
+    try:
+        start = perf_counter()
+        dial = DialP2()
+        with open(f.name, "r") as g:
+            for instruction in g:
+                dial.move(instruction.strip())
+        print(f"Serial: elapsed {perf_counter() - start:2.4f} seconds.")
+
+        start = perf_counter()
+        zeros, position = count_zeros_parallel(f.name)
+        print(f"Parallel: elapsed {perf_counter() - start:2.4f} seconds.")
+        assert (zeros, position) == (dial.zeros, dial.position)
+    finally:
+        os.remove(f.name)
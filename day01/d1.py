@@ -1,10 +1,18 @@
+import mmap
+from collections.abc import Iterator
+
+LEFT, RIGHT = ord("L"), ord("R")
+
+
 class Dial:
     def __init__(self):
         self.position = 50
         self.zeros = 0
 
     def move(self, instruction: str) -> None:
-        sign, clicks = self.parse_instruction(instruction)
+        self.rotate(*self.parse_instruction(instruction))
+
+    def rotate(self, sign: int, clicks: int) -> None:
         self.position = (self.position + sign * clicks) % 100
         if self.position == 0:
             self.zeros += 1
@@ -24,47 +32,75 @@ class Dial:
 
 
 class DialP2(Dial):
-    def move(self, instruction: str) -> None:
-        sign, clicks = self.parse_instruction(instruction)
+    def rotate(self, sign: int, clicks: int) -> None:
         old = self.position
         new = old + sign * clicks
         self.zeros += abs(new // 100 - old // 100)
         self.position = new % 100
 
     def move_brute_force(self, instructions: str) -> None:
-        sign, clicks = self.parse_instruction(instructions)
+        self.rotate_brute_force(*self.parse_instruction(instructions))
+
+    def rotate_brute_force(self, sign: int, clicks: int) -> None:
         for _ in range(clicks):
             self.position += sign
             self.position = self.position % 100
             self.zeros += self.position == 0
 
 
+def read_instructions(path) -> Iterator[tuple[int, int]]:
+    """
+    Streams (sign, clicks) pairs from a memory-mapped rotation log, so only
+    the current line is ever held as Python objects.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            start, size = 0, len(buf)
+            while start < size:
+                end = buf.find(b"\n", start)
+                if end == -1:
+                    end = size
+                direction = buf[start]
+                if direction == LEFT:
+                    sign = -1
+                elif direction == RIGHT:
+                    sign = +1
+                elif start == end or buf[start:end].isspace():
+                    start = end + 1
+                    continue
+                else:
+                    raise ValueError
+                clicks = int(buf[start + 1 : end])
+                if clicks == 0:
+                    raise ValueError
+                yield sign, clicks
+                start = end + 1
+
+
 if __name__ == "__main__":
     from pathlib import Path
 
-    with open(Path(__file__).parent / "input.txt", "r") as f:
-        instructions = f.readlines()
-
     dial = Dial()
-    for instruction in instructions:
-        dial.move(instruction.replace("\n", ""))
-    print(dial.zeros)
     dial2 = DialP2()
     dial3 = DialP2()
-    for i, instruction in enumerate(instructions):
-        dial2.move(instruction.replace("\n", ""))
-        dial3.move_brute_force(instruction.replace("\n", ""))
+    for sign, clicks in read_instructions(Path(__file__).parent / "input.txt"):
+        dial.rotate(sign, clicks)
+        dial2.rotate(sign, clicks)
+        dial3.rotate_brute_force(sign, clicks)
         if dial2.zeros != dial3.zeros:
             # print(
-            #     instruction.strip(),
+            #     sign,
+            #     clicks,
             #     dial2.position,
             #     dial3.position,
             #     dial2.zeros,
             #     dial3.zeros,
             # )
-            # print(i)
             # break
             ...
 
+    print(dial.zeros)
     print(dial2.zeros)
     print(dial3.zeros)
@@ -1,3 +1,8 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from heapq import merge
+from itertools import accumulate
 from math import ceil, log10
 
 
@@ -69,6 +74,148 @@ def check_valid_p2(low: int, high: int) -> set[int]:
     return valid
 
 
+def _mobius(n: int) -> int:
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+
+def _sum_periodic(low: int, high: int, digits: int, period: int) -> tuple[int, int]:
+    """
+    Sum and count of the numbers in [low, high] with `digits` digits made of a
+    block of `period` digits repeated, i.e. pattern * 1...0...1.
+    """
+    repunit = (10**digits - 1) // (10**period - 1)
+    first = max(10 ** (period - 1), -(-low // repunit))
+    last = min(10**period - 1, high // repunit)
+    if last < first:
+        return 0, 0
+    count = last - first + 1
+    return repunit * (first + last) * count // 2, count
+
+
+def sum_invalid(low: int, high: int, part: int = 2) -> tuple[int, int]:
+    """
+    Sum and count of the invalid IDs in [low, high], without generating them.
+
+    Part 1 only allows a pattern repeated exactly twice. For part 2, the IDs
+    with n digits are the union over the maximal proper divisors n/p of the
+    numbers with period n/p. Inclusion-exclusion over those (the intersection
+    of two periods is their gcd) gives -sum(mobius(k) * periodic(n/k)) over
+    the divisors k > 1 of n.
+    """
+    total, count = 0, 0
+    for digits in range(len(str(low)), len(str(high)) + 1):
+        lo = max(low, 10 ** (digits - 1))
+        hi = min(high, 10**digits - 1)
+        if part == 1:
+            if digits % 2 == 0:
+                s, c = _sum_periodic(lo, hi, digits, digits // 2)
+                total, count = total + s, count + c
+            continue
+        for k in range(2, digits + 1):
+            if digits % k == 0 and (mu := _mobius(k)):
+                s, c = _sum_periodic(lo, hi, digits, digits // k)
+                total, count = total - mu * s, count - mu * c
+    return total, count
+
+
+def _periodic_range(low: int, high: int, digits: int, period: int) -> range:
+    repunit = (10**digits - 1) // (10**period - 1)
+    first = max(10 ** (period - 1), -(-low // repunit))
+    last = min(10**period - 1, high // repunit)
+    return range(first * repunit, last * repunit + 1, repunit)
+
+
+def iter_invalid(low: int, high: int, part: int = 2) -> Iterator[int]:
+    """
+    Yields the invalid IDs in [low, high] in ascending order, without
+    duplicates. Within a digit count every period is a lazy arithmetic
+    progression, and heapq.merge interleaves them one value at a time.
+    """
+    for digits in range(len(str(low)), len(str(high)) + 1):
+        lo = max(low, 10 ** (digits - 1))
+        hi = min(high, 10**digits - 1)
+        if part == 1:
+            periods = [digits // 2] if digits % 2 == 0 else []
+        else:
+            periods = [p for p in range(1, digits // 2 + 1) if digits % p == 0]
+        previous = None
+        for value in merge(*[_periodic_range(lo, hi, digits, p) for p in periods]):
+            if value != previous:
+                yield value
+                previous = value
+
+
+# Up to 13 digits the running sums fit in unsigned 64 bit (the index then
+# holds about a million IDs); at 14 digits they would overflow.
+MAX_INDEX_DIGITS = 13
+
+
+class RepeatedPatternIndex:
+    def __init__(self, max_digits: int = 12):
+        """
+        Every invalid ID with up to `max_digits` digits (at most
+        MAX_INDEX_DIGITS), sorted, with running sums and counts for part 2
+        (any repetition) and part 1 (pattern repeated exactly twice). Every
+        digit count is streamed from iter_invalid, and all the columns are
+        compact arrays.
+        """
+        if not 1 <= max_digits <= MAX_INDEX_DIGITS:
+            raise ValueError(
+                f"max_digits must be between 1 and {MAX_INDEX_DIGITS}, "
+                f"not {max_digits}."
+            )
+        self.values = array("Q")
+        twice = array("B")
+        for digits in range(2, max_digits + 1):
+            half = 10 ** (digits // 2)
+            for value in iter_invalid(10 ** (digits - 1), 10**digits - 1):
+                self.values.append(value)
+                twice.append(digits % 2 == 0 and value // half == value % half)
+        self.prefix_sum = array("Q", [0])
+        self.prefix_sum.extend(accumulate(self.values))
+        self.prefix_sum_p1 = array("Q", [0])
+        self.prefix_sum_p1.extend(
+            accumulate(v if t else 0 for v, t in zip(self.values, twice))
+        )
+        self.prefix_count_p1 = array("Q", [0])
+        self.prefix_count_p1.extend(accumulate(twice))
+        self.max_value = 10**max_digits - 1
+
+    def query(self, low: int, high: int, part: int = 2) -> tuple[int, int]:
+        """
+        Sum and count of the invalid IDs in [low, high], same as sum_invalid.
+        """
+        if high > self.max_value:
+            raise ValueError(f"{high} is beyond the indexed range.")
+        i = bisect_left(self.values, low)
+        j = max(bisect_right(self.values, high), i)
+        if part == 1:
+            return (
+                self.prefix_sum_p1[j] - self.prefix_sum_p1[i],
+                self.prefix_count_p1[j] - self.prefix_count_p1[i],
+            )
+        return self.prefix_sum[j] - self.prefix_sum[i], j - i
+
+
+def merge_pairs(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged = []
+    for low, high in sorted(pairs):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
 if __name__ == "__main__":
     from pathlib import Path
     from time import perf_counter
@@ -97,3 +244,22 @@ if __name__ == "__main__":
     # print(sum(valid))
     # print(sum(valid_part_2))
     print(sum(vp2))
+
+    start = perf_counter()
+    pairs = [tuple(map(int, pair.split("-"))) for pair in input_.split(",")]
+    pairs = merge_pairs(pairs)
+    print(sum(sum_invalid(low, high, part=1)[0] for low, high in pairs))
+    print(sum(sum_invalid(low, high)[0] for low, high in pairs))
+    print(f"Elapsed {perf_counter() - start:2.4f} seconds")
+
+    start = perf_counter()
+    print(sum(sum(iter_invalid(low, high)) for low, high in pairs))
+    print(f"Elapsed {perf_counter() - start:2.4f} seconds")
+
+    start = perf_counter()
+    index = RepeatedPatternIndex(max_digits=len(str(pairs[-1][1])))
+    print(f"Index built in {perf_counter() - start:2.4f} seconds")
+    start = perf_counter()
+    print(sum(index.query(low, high, part=1)[0] for low, high in pairs))
+    print(sum(index.query(low, high)[0] for low, high in pairs))
+    print(f"Elapsed {perf_counter() - start:2.4f} seconds")
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+def load_banks(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the banks as a (lines, max length) uint8 matrix of digit values,
+    padded with zeros when lines are ragged, plus the length of every line.
+    """
+    data = data.strip().replace(b"\r", b"")
+    buf = np.frombuffer(data + b"\n", dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    width = int(lengths.max())
+    if np.all(lengths == width):
+        matrix = buf.reshape(len(lengths), width + 1)[:, :width] - ord("0")
+        return matrix, lengths
+    matrix = np.zeros((len(lengths), width), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    cols = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    is_digit = buf != ord("\n")
+    matrix[rows, cols] = buf[is_digit] - ord("0")
+    return matrix, lengths
+
+
+def _table_layout(lengths: np.ndarray, digits: int, width: int) -> tuple[int, np.dtype]:
+    """
+    Number of levels and dtype of the sparse table of _joltage_chunk.
+    """
+    n_levels = int(np.log2(max(int((lengths - digits).max()) + 1, 1))) + 1
+    dtype = np.int16 if 10 * width <= np.iinfo(np.int16).max else np.int64
+    return n_levels, np.dtype(dtype)
+
+
+def joltage_batch(
+    matrix: np.ndarray,
+    lengths: np.ndarray,
+    digits: int = 12,
+    max_bytes: int = 1 << 28,
+) -> np.ndarray:
+    """
+    Same greedy as joltage, for all rows at once: the j-th digit is the first
+    maximum in the window between the previous pick and the last position that
+    still leaves room for the remaining digits. A sparse table takes
+    levels * rows * width entries, so rows are processed in chunks whose table
+    fits in `max_bytes` (at least one row per chunk).
+    """
+    if np.any(lengths < digits):
+        raise ValueError(f"Every bank needs at least {digits} batteries.")
+    # int64 holds up to 18 digits, beyond that fall back to Python ints.
+    values = np.zeros(len(lengths), dtype=np.int64 if digits <= 18 else object)
+    if not len(lengths):
+        return values
+    n_levels, dtype = _table_layout(lengths, digits, matrix.shape[1])
+    chunk = max(max_bytes // (n_levels * matrix.shape[1] * dtype.itemsize), 1)
+    for offset in range(0, len(lengths), chunk):
+        rows = slice(offset, offset + chunk)
+        values[rows] = _joltage_chunk(matrix[rows], lengths[rows], digits, values.dtype)
+    return values
+
+
+def _joltage_chunk(
+    matrix: np.ndarray, lengths: np.ndarray, digits: int, values_dtype: np.dtype
+) -> np.ndarray:
+    """
+    Every window argmax is a range maximum query on a sparse table of
+    digit * width + (width - 1 - column): the largest key is the largest digit,
+    and among equal digits the leftmost one.
+    """
+    n_rows, width = matrix.shape
+    n_levels, dtype = _table_layout(lengths, digits, width)
+    table = np.empty((n_levels, n_rows, width), dtype=dtype)
+    np.multiply(matrix, width, out=table[0], dtype=dtype)
+    table[0] += np.arange(width - 1, -1, -1, dtype=dtype)
+    for level in range(1, n_levels):
+        half = 2 ** (level - 1)
+        previous, current = table[level - 1], table[level]
+        np.maximum(previous[:, :-half], previous[:, half:], out=current[:, :-half])
+        current[:, -half:] = previous[:, -half:]
+
+    rows = np.arange(n_rows)
+    start = np.zeros(n_rows, dtype=np.int64)
+    values = np.zeros(n_rows, dtype=values_dtype)
+    for j in range(digits):
+        stop = lengths - digits + j
+        level = np.log2(stop - start + 1).astype(np.int64)
+        best = np.maximum(
+            table[level, rows, start], table[level, rows, stop - 2**level + 1]
+        )
+        picks = width - 1 - best % width
+        values = values * 10 + (best // width).astype(values.dtype)
+        start = picks + 1
+    return values
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import joltage
+
+    with open(Path(__file__).parent / "input.txt", "rb") as f:
+        matrix, lengths = load_banks(f.read())
+    print(joltage_batch(matrix, lengths, digits=2).sum())
+    print(joltage_batch(matrix, lengths, digits=12).sum())
+
+    rng = np.random.default_rng(0)
+    n_lines = 100_000
+    banks = rng.integers(1, 10, size=(n_lines, 100), dtype=np.uint8) + ord("0")
+    data = b"\n".join(row.tobytes() for row in banks)
+
+    start = perf_counter()
+    lines = data.decode().split("\n")
+    values = [joltage(line, digits=12) for line in lines]
+    print(f"Per line: elapsed={perf_counter() - start:2.4f} seconds.")
+
+    start = perf_counter()
+    batch_values = joltage_batch(*load_banks(data), digits=12)
+    print(f"Batch: elapsed={perf_counter() - start:2.4f} seconds.")
+    assert batch_values.tolist() == values
@@ -1,4 +1,80 @@
+from bisect import bisect
+from functools import cache
+
+# int() on more digits than this hits the int(str) limit of Python >= 3.11
+# (4300 digits by default) and is quadratic anyway.
+INT_CHUNK = 2048
+
+
+@cache
+def _power_of_ten(exponent: int) -> int:
+    return 10**exponent
+
+
+def digits_to_int(digits: bytes) -> int:
+    """
+    int(digits) for any number of digits: the two halves are converted
+    recursively and joined with one multiplication.
+    """
+    if len(digits) <= INT_CHUNK:
+        return int(digits)
+    half = len(digits) // 2
+    high, low = digits_to_int(digits[:-half]), digits_to_int(digits[-half:])
+    return high * _power_of_ten(half) + low
+
+
 def joltage(line: str, digits: int = 12) -> int:
+    """
+    Monotonic stack over the raw bytes: a digit evicts smaller digits before it
+    as long as enough digits remain to still pick `digits` of them.
+    The stack is O(len(line)) regardless of `digits`, then digits_to_int
+    converts the result.
+    """
+    to_drop = len(line) - digits
+    stack = bytearray()
+    for byte in line.encode():
+        while to_drop > 0 and stack and stack[-1] < byte:
+            stack.pop()
+            to_drop -= 1
+        stack.append(byte)
+    return digits_to_int(stack[:digits]) if stack else 0
+
+
+def joltage_sweep(line: str, max_digits: int | None = None) -> list[int]:
+    """
+    joltage(line, digits=k) for every k in 1..max_digits (default: the whole
+    line), as a list indexed by k - 1.
+
+    Dropping digits one at a time, always the first one smaller than its
+    successor (or the last one if there is none), is optimal for every k, and
+    it is exactly the order in which the joltage stack pops. So one stack pass
+    gives a single drop order, and the best k digits are the last k dropped:
+    the sweep is O(n) plus an insertion and a digits_to_int per k. The
+    conversions dominate: they are superlinear in k, so quadratic or worse
+    in total.
+    """
+    data = line.encode()
+    dropped = []
+    stack = []
+    for position, byte in enumerate(data):
+        while stack and data[stack[-1]] < byte:
+            dropped.append(stack.pop())
+        stack.append(position)
+    dropped.extend(reversed(stack))
+
+    max_digits = len(data) if max_digits is None else min(max_digits, len(data))
+    kept = []
+    digits = bytearray()
+    values = []
+    for position in reversed(dropped[len(dropped) - max_digits :]):
+        i = bisect(kept, position)
+        kept.insert(i, position)
+        digits.insert(i, data[position])
+        values.append(digits_to_int(digits))
+    return values
+
+
+def joltage_v1(line: str, digits: int = 12) -> int:
     numbers = list(line)[::-1]
     current = numbers[:digits]
     current_best = _get_value(current)
@@ -40,3 +116,27 @@ if __name__ == "__main__":
         values.append(joltage(line, digits=12))
     print(sum(values))
     print(f"Elapsed={perf_counter() - start:2.4f} seconds.")
+
+    import random
+
+    random.seed(0)
+    line = "".join(random.choices("123456789", k=10**6))
+    start = perf_counter()
+    value = joltage(line, digits=12)
+    print(f"Stack, 10^6 digits: elapsed={perf_counter() - start:2.4f} seconds.")
+    start = perf_counter()
+    assert joltage_v1(line, digits=12) == value
+    print(f"V1, 10^6 digits: elapsed={perf_counter() - start:2.4f} seconds.")
+
+    line = line[:2000]
+    start = perf_counter()
+    sweep = joltage_sweep(line)
+    print(f"Sweep, 2000 digits: elapsed={perf_counter() - start:2.4f} seconds.")
+    start = perf_counter()
+    assert sweep == [joltage(line, digits=k) for k in range(1, len(line) + 1)]
+    print(f"Per k, 2000 digits: elapsed={perf_counter() - start:2.4f} seconds.")
+
+    # Past the 4300 digits int(str) limit of Python >= 3.11.
+    line = "".join(random.choices("123456789", k=10_000))
+    assert joltage_sweep(line[:5000])[-1] == joltage(line[:5000], digits=5000)
+    assert joltage(line, digits=10_000) == digits_to_int(line.encode())
@@ -0,0 +1,122 @@
+from p2 import Position
+
+
+def parse_rows(input_: str) -> list[int]:
+    """
+    Every row as an int with bit x set when there is a roll at column x.
+    """
+    return [
+        int(line[::-1].replace("@", "1").replace(".", "0") or "0", 2)
+        for line in input_.strip().split("\n")
+    ]
+
+
+def positions_to_rows(positions: set[Position]) -> list[int]:
+    rows = [0] * (max(y for _, y in positions) + 1 if positions else 0)
+    for x, y in positions:
+        rows[y] |= 1 << x
+    return rows
+
+
+def rows_to_positions(rows: list[int]) -> set[Position]:
+    positions = set()
+    for y, row in enumerate(rows):
+        while row:
+            low = row & -row
+            positions.add((low.bit_length() - 1, y))
+            row ^= low
+    return positions
+
+
+def accessible_row(above: int, row: int, below: int) -> int:
+    """
+    Rolls of `row` with fewer than 4 neighbours, for the whole row at once.
+
+    The 8 shifted neighbour masks are summed into a bit-sliced 3 bit counter
+    (c0, c1, c2) plus a sticky overflow bit; a count >= 4 is c2 | overflow.
+    """
+    c0 = c1 = c2 = overflow = 0
+    for mask in (
+        above << 1,
+        above,
+        above >> 1,
+        row << 1,
+        row >> 1,
+        below << 1,
+        below,
+        below >> 1,
+    ):
+        carry = c0 & mask
+        c0 ^= mask
+        carry, c1 = c1 & carry, c1 ^ carry
+        carry, c2 = c2 & carry, c2 ^ carry
+        overflow |= carry
+    return row & ~(c2 | overflow)
+
+
+def accessible(rows: list[int]) -> list[int]:
+    padded = [0, *rows, 0]
+    return [
+        accessible_row(padded[y - 1], padded[y], padded[y + 1])
+        for y in range(1, len(padded) - 1)
+    ]
+
+
+def remove_rolls(rows: list[int]) -> list[int]:
+    """
+    Same result as p2.remove_rolls. After the first wave only the rows next
+    to a row that changed can have new accessible rolls.
+    """
+    rows = [0, *rows, 0]
+    dirty = set(range(1, len(rows) - 1))
+    while dirty:
+        removed = {}
+        for y in dirty:
+            if mask := accessible_row(rows[y - 1], rows[y], rows[y + 1]):
+                removed[y] = mask
+        for y, mask in removed.items():
+            rows[y] &= ~mask
+        dirty = {
+            y + dy for y in removed for dy in (-1, 0, 1) if 0 < y + dy < len(rows) - 1
+        }
+    return rows[1:-1]
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import remove_rolls as remove_rolls_set
+    from p2 import remove_rolls_v2
+
+    with open(Path(__file__).parent / "input.txt", "r") as f:
+        input_ = f.read().strip()
+
+    rows = parse_rows(input_)
+    n_original_rolls = sum(row.bit_count() for row in rows)
+    print(f"Accessible: {sum(row.bit_count() for row in accessible(rows))} rolls.")
+    final_rows = remove_rolls(rows)
+    n_final_rolls = sum(row.bit_count() for row in final_rows)
+    print(f"Removed: {n_original_rolls - n_final_rolls} rolls of paper.")
+
+    import random
+
+    random.seed(0)
+    for width in [100, 1_000, 10_000, 100_000]:
+        height = 200
+        rows = [
+            random.getrandbits(width) | random.getrandbits(width) for _ in range(height)
+        ]
+        start = perf_counter()
+        final_rows = remove_rolls(rows)
+        print(f"Bitboard {width} wide: elapsed {perf_counter() - start:2.4f} seconds.")
+        if width > 1_000:
+            continue
+        positions = rows_to_positions(rows)
+        start = perf_counter()
+        final_rolls = remove_rolls_set(positions)
+        print(f"Set {width} wide: elapsed {perf_counter() - start:2.4f} seconds.")
+        start = perf_counter()
+        final_rolls_v2 = remove_rolls_v2(positions)
+        print(f"Set v2 {width} wide: elapsed {perf_counter() - start:2.4f} seconds.")
+        assert rows_to_positions(final_rows) == final_rolls == final_rolls_v2
@@ -0,0 +1,89 @@
+import numpy as np
+
+from p2 import Position
+
+NEIGHBORS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+
+def parse_grid(input_: str) -> np.ndarray:
+    """
+    Rolls as a uint8 array with a one cell border of zeros, so shifted views
+    never need bounds checks.
+    """
+    lines = input_.strip().split("\n")
+    width = max(len(line) for line in lines)
+    buf = np.frombuffer(
+        "".join(line.ljust(width, ".") for line in lines).encode(), dtype=np.uint8
+    )
+    grid = np.zeros((len(lines) + 2, width + 2), dtype=np.uint8)
+    grid[1:-1, 1:-1] = (buf == ord("@")).reshape(len(lines), width)
+    return grid
+
+
+def grid_to_positions(grid: np.ndarray) -> set[Position]:
+    ys, xs = np.nonzero(grid)
+    return set(zip((xs - 1).tolist(), (ys - 1).tolist()))
+
+
+def neighbor_counts(grid: np.ndarray) -> np.ndarray:
+    height, width = grid.shape
+    counts = np.zeros_like(grid)
+    for dy, dx in NEIGHBORS:
+        counts[1:-1, 1:-1] += grid[1 + dy : height - 1 + dy, 1 + dx : width - 1 + dx]
+    return counts
+
+
+def remove_rolls(grid: np.ndarray) -> np.ndarray:
+    """
+    Same result as p2.remove_rolls, on a padded grid from parse_grid.
+
+    The first wave is a mask over the whole grid. After that, only the
+    neighbours of the rolls just removed can become accessible, so each wave
+    updates the counts around the removed rolls and checks just those cells.
+    """
+    grid = grid.copy()
+    counts = neighbor_counts(grid)
+    ys, xs = np.nonzero(grid & (counts < 4))
+    width = grid.shape[1]
+    flat_grid = grid.reshape(-1)
+    flat_counts = counts.reshape(-1)
+    removed = ys * width + xs
+    offsets = np.array([dy * width + dx for dy, dx in NEIGHBORS])
+    while len(removed):
+        flat_grid[removed] = 0
+        # Indices within one offset are distinct, so plain fancy indexing works.
+        for offset in offsets:
+            flat_counts[removed + offset] -= 1
+        neighbors = (removed[:, None] + offsets).reshape(-1)
+        neighbors = np.sort(
+            neighbors[(flat_grid[neighbors] == 1) & (flat_counts[neighbors] < 4)]
+        )
+        removed = neighbors[np.diff(neighbors, prepend=-1) != 0]
+    return grid
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import remove_rolls as remove_rolls_set
+
+    with open(Path(__file__).parent / "input.txt", "r") as f:
+        input_ = f.read().strip()
+
+    grid = parse_grid(input_)
+    final_grid = remove_rolls(grid)
+    print(f"Removed: {int(grid.sum()) - int(final_grid.sum())} rolls of paper.")
+
+    rng = np.random.default_rng(0)
+    for size in [1_000, 10_000]:
+        grid = np.zeros((size + 2, size + 2), dtype=np.uint8)
+        grid[1:-1, 1:-1] = rng.random((size, size)) < 0.6
+        start = perf_counter()
+        final_grid = remove_rolls(grid)
+        print(f"Grid {size}x{size}: elapsed {perf_counter() - start:2.4f} seconds.")
+        if size <= 1_000:
+            start = perf_counter()
+            final_rolls = remove_rolls_set(grid_to_positions(grid))
+            print(f"Set {size}x{size}: elapsed {perf_counter() - start:2.4f} seconds.")
+            assert final_rolls == grid_to_positions(final_grid)
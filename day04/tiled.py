@@ -0,0 +1,175 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from grid import neighbor_counts
+
+Bounds = tuple[int, int, int, int]
+
+
+def grid_shape(path) -> tuple[int, int]:
+    """
+    Height and width of a grid file made of equally long lines.
+    """
+    with open(path, "rb") as f:
+        width = len(f.readline().rstrip(b"\n"))
+        size = f.seek(0, 2)
+    if size % (width + 1) not in (0, width):
+        raise ValueError("All the lines of the grid must have the same length.")
+    return (size + 1) // (width + 1), width
+
+
+def load_state(path, state_path, rows_per_chunk: int = 1024) -> int:
+    """
+    Writes the rolls of the grid file as a flat 0/1 uint8 file, a chunk of rows
+    at a time. Returns the number of rolls.
+    """
+    height, width = grid_shape(path)
+    chars = np.memmap(path, dtype=np.uint8, mode="r")
+    state = np.memmap(state_path, dtype=np.uint8, mode="w+", shape=(height, width))
+    n_rolls = 0
+    for y0 in range(0, height, rows_per_chunk):
+        y1 = min(y0 + rows_per_chunk, height)
+        rows = np.array(chars[y0 * (width + 1) : y1 * (width + 1)])
+        if len(rows) < (y1 - y0) * (width + 1):
+            rows = np.append(rows, np.uint8(ord("\n")))
+        rows = rows.reshape(y1 - y0, width + 1)[:, :width] == ord("@")
+        state[y0:y1] = rows
+        n_rolls += int(rows.sum())
+    state.flush()
+    return n_rolls
+
+
+def tile_bounds(height: int, width: int, tile: int) -> list[Bounds]:
+    return [
+        (y0, min(y0 + tile, height), x0, min(x0 + tile, width))
+        for y0 in range(0, height, tile)
+        for x0 in range(0, width, tile)
+    ]
+
+
+def _find_removable(
+    state_path, removed_path, shape: tuple[int, int], bounds: Bounds
+) -> int:
+    """
+    Reads a tile plus its 1 cell halo from the shared state and writes the
+    accessible rolls of the tile to the shared removal mask.
+    """
+    height, width = shape
+    y0, y1, x0, x1 = bounds
+    state = np.memmap(state_path, dtype=np.uint8, mode="r", shape=shape)
+    block = np.zeros((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+    hy0, hy1 = max(y0 - 1, 0), min(y1 + 1, height)
+    hx0, hx1 = max(x0 - 1, 0), min(x1 + 1, width)
+    halo = state[hy0:hy1, hx0:hx1]
+    block[hy0 - y0 + 1 : hy1 - y0 + 1, hx0 - x0 + 1 : hx1 - x0 + 1] = halo
+    counts = neighbor_counts(block)
+    mask = block[1:-1, 1:-1] & (counts[1:-1, 1:-1] < 4)
+    removed = np.memmap(removed_path, dtype=np.uint8, mode="r+", shape=shape)
+    removed[y0:y1, x0:x1] = mask
+    removed.flush()
+    return int(mask.sum())
+
+
+def _apply_removal(
+    state_path, removed_path, shape: tuple[int, int], bounds: Bounds
+) -> None:
+    y0, y1, x0, x1 = bounds
+    state = np.memmap(state_path, dtype=np.uint8, mode="r+", shape=shape)
+    removed = np.memmap(removed_path, dtype=np.uint8, mode="r", shape=shape)
+    state[y0:y1, x0:x1] -= removed[y0:y1, x0:x1]
+    state.flush()
+
+
+def remove_rolls_tiled(
+    path, tile: int = 1024, max_workers: int | None = None
+) -> tuple[int, int]:
+    """
+    Out-of-core p2.remove_rolls. Returns (rolls, removed rolls).
+
+    The state lives in memory-mapped files. Every wave runs in two parallel
+    phases: tiles find their accessible rolls reading the 1 cell halo from
+    the shared state, then apply them. This keeps every wave synchronous
+    across tiles. Only tiles next to a tile that changed are revisited, and
+    peak memory is a few tiles per worker.
+    """
+    shape = grid_shape(path)
+    tiles = tile_bounds(*shape, tile)
+    n_tiles_x = -(-shape[1] // tile)
+    with tempfile.TemporaryDirectory() as workdir, ProcessPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        state_path = os.path.join(workdir, "state.bin")
+        removed_path = os.path.join(workdir, "removed.bin")
+        n_rolls = load_state(path, state_path)
+        np.memmap(removed_path, dtype=np.uint8, mode="w+", shape=shape).flush()
+        n_removed = 0
+        dirty = list(range(len(tiles)))
+        while dirty:
+            counts = list(
+                executor.map(
+                    _find_removable,
+                    [state_path] * len(dirty),
+                    [removed_path] * len(dirty),
+                    [shape] * len(dirty),
+                    [tiles[i] for i in dirty],
+                )
+            )
+            n_removed += sum(counts)
+            changed = [i for i, count in zip(dirty, counts) if count]
+            list(
+                executor.map(
+                    _apply_removal,
+                    [state_path] * len(changed),
+                    [removed_path] * len(changed),
+                    [shape] * len(changed),
+                    [tiles[i] for i in changed],
+                )
+            )
+            dirty = sorted(
+                {
+                    (ty + dy) * n_tiles_x + tx + dx
+                    for ty, tx in (divmod(i, n_tiles_x) for i in changed)
+                    for dy in (-1, 0, 1)
+                    for dx in (-1, 0, 1)
+                    if 0 <= (ty + dy) * tile < shape[0]
+                    and 0 <= (tx + dx) * tile < shape[1]
+                }
+            )
+    return n_rolls, n_removed
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import remove_rolls
+
+    path = Path(__file__).parent / "input.txt"
+    n_rolls, n_removed = remove_rolls_tiled(path, tile=64)
+    print(f"Removed: {n_removed} rolls of paper.")
+
+    with open(path, "r") as f:
+        input_ = f.read().strip()
+    positions = set()
+    for y, line in enumerate(input_.split("\n")):
+        for x, char in enumerate(line):
+            if char == "@":
+                positions.add((x, y))
+    assert n_rolls - n_removed == len(remove_rolls(positions))
+
+    rng = np.random.default_rng(0)
+    size = 4_000
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as f:
+        for _ in range(size):
+            row = np.where(rng.random(size) < 0.6, ord("@"), ord("."))
+            f.write(row.astype(np.uint8).tobytes() + b"\n")
+    try:
+        start = perf_counter()
+        n_rolls, n_removed = remove_rolls_tiled(f.name, tile=1024)
+        print(f"Removed: {n_removed} of {n_rolls} rolls of paper.")
+        print(f"Tiled {size}x{size}: elapsed {perf_counter() - start:2.4f} seconds.")
+    finally:
+        os.remove(f.name)
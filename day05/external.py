@@ -0,0 +1,116 @@
+import os
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from heapq import merge
+from itertools import islice
+
+
+def read_ranges(path) -> Iterator[tuple[int, int]]:
+    """
+    Streams the "low-high" lines of the input, up to the first blank line.
+    """
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                return
+            low, high = line.split("-")
+            yield int(low), int(high)
+
+
+def spill_sorted_runs(
+    ranges: Iterable[tuple[int, int]], workdir: str, chunk_size: int
+) -> list[str]:
+    """
+    Sorts the ranges `chunk_size` at a time and writes every sorted run to a
+    binary file of packed int64 (low, high) pairs.
+    """
+    runs = []
+    ranges = iter(ranges)
+    while chunk := sorted(islice(ranges, chunk_size)):
+        run_path = os.path.join(workdir, f"run_{len(runs)}.bin")
+        with open(run_path, "wb") as f:
+            array("q", [bound for pair in chunk for bound in pair]).tofile(f)
+        runs.append(run_path)
+    return runs
+
+
+def read_run(run_path: str, buffer_size: int) -> Iterator[tuple[int, int]]:
+    with open(run_path, "rb") as f:
+        while True:
+            buffer = array("q")
+            try:
+                buffer.fromfile(f, 2 * buffer_size)
+            except EOFError:
+                pass
+            if not buffer:
+                return
+            yield from zip(buffer[::2], buffer[1::2])
+
+
+def coalesce(sorted_ranges: Iterable[tuple[int, int]]) -> Iterator[tuple[int, int]]:
+    """
+    Streaming merge_ranges for input that is already sorted.
+    """
+    sorted_ranges = iter(sorted_ranges)
+    for low, high in sorted_ranges:
+        break
+    else:
+        return
+    for next_low, next_high in sorted_ranges:
+        if next_low <= high:
+            high = max(high, next_high)
+        else:
+            yield low, high
+            low, high = next_low, next_high
+    yield low, high
+
+
+def merge_ranges_external(
+    path, output_path, chunk_size: int = 1_000_000, buffer_size: int = 65_536
+) -> int:
+    """
+    Out-of-core merge_ranges: sorted runs are spilled to disk and then k-way
+    merged, so memory is one chunk while sorting and one buffer per run while
+    merging. Writes the merged ranges to `output_path` in the input format and
+    returns the total fresh count.
+    """
+    total_fresh = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = spill_sorted_runs(read_ranges(path), workdir, chunk_size)
+        merged = merge(*[read_run(run, buffer_size) for run in runs])
+        with open(output_path, "w") as f:
+            for low, high in coalesce(merged):
+                f.write(f"{low}-{high}\n")
+                total_fresh += high - low + 1
+    return total_fresh
+
+
+if __name__ == "__main__":
+    import random
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import merge_ranges
+
+    path = Path(__file__).parent / "input.txt"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as output:
+        pass
+    try:
+        total_fresh = merge_ranges_external(path, output.name, chunk_size=50)
+        print(f"I have found {total_fresh} fresh ingredients.")
+        ranges = merge_ranges(list(read_ranges(path)))
+        assert total_fresh == sum([high - low + 1 for low, high in ranges])
+
+        random.seed(0)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            for _ in range(2_000_000):
+                low = random.randint(1, 10**15)
+                f.write(f"{low}-{low + random.randint(0, 10**8)}\n")
+        start = perf_counter()
+        total_fresh = merge_ranges_external(f.name, output.name, chunk_size=250_000)
+        print(f"I have found {total_fresh} fresh ingredients.")
+        print(f"Elapsed {perf_counter() - start:2.4f} seconds.")
+        os.remove(f.name)
+    finally:
+        os.remove(output.name)
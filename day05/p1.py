@@ -1,3 +1,14 @@
+from array import array
+from bisect import bisect_right
+
+from p2 import merge_ranges
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 def check_naive_fresh(ingredient: int, ranges: list[tuple[int, int]]) -> bool:
     """
     This is the most naive solution.
@@ -18,6 +29,36 @@ def check_naive_fresh(ingredient: int, ranges: list[tuple[int, int]]) -> bool:
     return False
 
 
+class RangeIndex:
+    def __init__(self, ranges: list[tuple[int, int]]):
+        """
+        Merged ranges stored as two sorted arrays of lower and upper bounds,
+        NumPy ones when available.
+        """
+        merged = merge_ranges(ranges)
+        self.lows = array("q", [low for low, _ in merged])
+        self.highs = array("q", [high for _, high in merged])
+        if np is not None:
+            self.lows = np.frombuffer(self.lows, dtype=np.int64)
+            self.highs = np.frombuffer(self.highs, dtype=np.int64)
+        self.coverage = sum(high - low + 1 for low, high in merged)
+
+    def __contains__(self, ingredient: int) -> bool:
+        i = bisect_right(self.lows, ingredient) - 1
+        return i >= 0 and ingredient <= self.highs[i]
+
+    def contains(self, ingredients: list[int]) -> list[bool]:
+        """
+        Membership of a whole batch: one searchsorted call with NumPy,
+        a bisect per ingredient without.
+        """
+        if np is None or not len(self.lows):
+            return [ingredient in self for ingredient in ingredients]
+        values = np.asarray(ingredients, dtype=np.int64)
+        i = np.searchsorted(self.lows, values, side="right") - 1
+        return ((i >= 0) & (values <= self.highs[np.maximum(i, 0)])).tolist()
+
+
 if __name__ == "__main__":
     from pathlib import Path
 
@@ -30,3 +71,7 @@ if __name__ == "__main__":
     ingredients = list(map(int, ingredients_str.split("\n")))
     n_fresh = sum([check_naive_fresh(ingredient, ranges) for ingredient in ingredients])
     print(f"I found {n_fresh} fresh ingredients.")
+    index = RangeIndex(ranges)
+    n_fresh = sum(index.contains(ingredients))
+    print(f"I found {n_fresh} fresh ingredients.")
+    print(f"The ranges cover {index.coverage} ingredients.")
@@ -1,4 +1,4 @@
-from collections import deque
+from collections import Counter, deque
 
 
 def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
@@ -13,6 +13,90 @@ def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
     return merged_ranges
 
 
+class CoverageNode:
+    def __init__(self):
+        self.count = 0
+        self.covered = 0
+        self.left: CoverageNode | None = None
+        self.right: CoverageNode | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        No range covers any of the node: it can be dropped, and is built again
+        on the next insert.
+        """
+        return not self.count and self.left is None and self.right is None
+
+
+class IntervalSet:
+    def __init__(self, max_value: int = 2**60):
+        """
+        Multiset of ranges kept in a lazily built segment tree over
+        [0, max_value]. Every node stores how many ranges cover it entirely and
+        how much of it is covered, so insert, delete and membership are
+        O(log max_value) and the coverage is always at the root.
+        """
+        self.size = 1 << max_value.bit_length()
+        self.root = CoverageNode()
+        self.ranges = Counter()
+
+    @property
+    def coverage(self) -> int:
+        return self.root.covered
+
+    def add(self, low: int, high: int) -> None:
+        if not 0 <= low <= high < self.size:
+            raise ValueError(f"Range {low}-{high} is out of bounds.")
+        self.ranges[(low, high)] += 1
+        self._update(self.root, 0, self.size, low, high + 1, 1)
+
+    def remove(self, low: int, high: int) -> None:
+        if not self.ranges[(low, high)]:
+            raise KeyError((low, high))
+        self.ranges[(low, high)] -= 1
+        if not self.ranges[(low, high)]:
+            del self.ranges[(low, high)]
+        self._update(self.root, 0, self.size, low, high + 1, -1)
+
+    def _update(
+        self, node: CoverageNode, lo: int, hi: int, low: int, high: int, delta: int
+    ) -> None:
+        if low <= lo and hi <= high:
+            node.count += delta
+        else:
+            mid = (lo + hi) // 2
+            if low < mid:
+                node.left = node.left or CoverageNode()
+                self._update(node.left, lo, mid, low, high, delta)
+                if node.left.is_empty:
+                    node.left = None
+            if high > mid:
+                node.right = node.right or CoverageNode()
+                self._update(node.right, mid, hi, low, high, delta)
+                if node.right.is_empty:
+                    node.right = None
+        if node.count:
+            node.covered = hi - lo
+        else:
+            node.covered = (node.left.covered if node.left else 0) + (
+                node.right.covered if node.right else 0
+            )
+
+    def __contains__(self, value: int) -> bool:
+        if not 0 <= value < self.size:
+            return False
+        node, lo, hi = self.root, 0, self.size
+        while node:
+            if node.count:
+                return True
+            mid = (lo + hi) // 2
+            node, lo, hi = (
+                (node.left, lo, mid) if value < mid else (node.right, mid, hi)
+            )
+        return False
+
+
 if __name__ == "__main__":
     from pathlib import Path
 
@@ -23,6 +107,10 @@ if __name__ == "__main__":
         low, high = line.split("-")
         ranges.append((int(low), int(high)))
     print(len(ranges))
+    interval_set = IntervalSet()
+    for low, high in ranges:
+        interval_set.add(low, high)
+    print(f"Live coverage: {interval_set.coverage} fresh ingredients.")
     ranges = merge_ranges(ranges)
     print(len(ranges))
     total_fresh_ingredients = sum([high - low + 1 for low, high in ranges])
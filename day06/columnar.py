@@ -0,0 +1,92 @@
+import numpy as np
+
+from product_tree import REDUCERS
+
+SPACE = ord(" ")
+
+Span = tuple[int, int, str]
+
+
+def load_worksheet(input_: str) -> np.ndarray:
+    """
+    The worksheet as a (lines, columns) uint8 matrix, ragged lines padded with
+    spaces. The last line is the operator row.
+    """
+    lines = input_.strip("\n").split("\n")
+    width = max(len(line) for line in lines)
+    data = "".join(line.ljust(width) for line in lines).encode()
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(lines), width)
+
+
+def problem_spans(matrix: np.ndarray) -> list[Span]:
+    """
+    (first column, end column, operator) of every problem: a problem starts at
+    its operator and ends at the next column that is blank on every line.
+    """
+    operators = matrix[-1]
+    starts = np.flatnonzero((operators == ord("*")) | (operators == ord("+")))
+    blanks = np.flatnonzero(np.all(matrix == SPACE, axis=0))
+    ends = np.append(blanks, matrix.shape[1])[np.searchsorted(blanks, starts)]
+    return [
+        (int(start), int(end), chr(operators[start]))
+        for start, end in zip(starts, ends)
+    ]
+
+
+def _accumulate(digits: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Reads the numbers along `axis`, skipping the blanks: one vectorized
+    multiply-add per position.
+    """
+    digits = np.moveaxis(digits, axis, 0)
+    dtype = np.int64 if digits.shape[0] <= 18 else object
+    values = np.zeros(digits.shape[1:], dtype=dtype)
+    for row in digits:
+        is_digit = row != SPACE
+        values = np.where(
+            is_digit, values * 10 + (row - ord("0")).astype(dtype), values
+        )
+    return values
+
+
+def column_numbers(matrix: np.ndarray) -> np.ndarray:
+    """
+    The number written top to bottom in every column (part 2), for all the
+    columns at once.
+    """
+    return _accumulate(matrix[:-1], axis=0)
+
+
+def row_numbers(matrix: np.ndarray, spans: list[Span]) -> list[np.ndarray]:
+    """
+    For every problem, the numbers written left to right on each line (part 1).
+    """
+    return [_accumulate(matrix[:-1, start:end], axis=1) for start, end, _ in spans]
+
+
+def solve_p1(matrix: np.ndarray) -> list[int]:
+    spans = problem_spans(matrix)
+    return [
+        REDUCERS[op](numbers.tolist())
+        for (_, _, op), numbers in zip(spans, row_numbers(matrix, spans))
+    ]
+
+
+def solve_p2(matrix: np.ndarray) -> list[int]:
+    numbers = column_numbers(matrix).tolist()
+    return [
+        REDUCERS[op](numbers[start:end]) for start, end, op in problem_spans(matrix)
+    ]
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    with open(Path(__file__).parent / "input.txt", "r") as f:
+        input_ = f.read()
+    start = perf_counter()
+    matrix = load_worksheet(input_)
+    print(sum(solve_p1(matrix)))
+    print(sum(solve_p2(matrix)))
+    print(f"Elapsed {perf_counter() - start:2.4f} seconds.")
@@ -1,15 +1,60 @@
 from typing import Literal
+import os
 import re
 
+from product_tree import REDUCERS, StreamingProduct
+
 OPERATORS = {"*": int.__mul__, "+": int.__add__}
 
 
 def solve(problems: list[list[int]], ops: Literal["*", "+"]):
-    accumulators = [1 if op == "*" else 0 for op in ops]
+    columns = [[] for _ in ops]
     for line in problems:
-        for i, (op, number) in enumerate(zip(ops, line)):
-            accumulators[i] = OPERATORS[op](accumulators[i], number)
-    return accumulators
+        for column, number in zip(columns, line):
+            column.append(number)
+    return [REDUCERS[op](column) for op, column in zip(ops, columns)]
+
+
+def read_operators(path, block_size: int = 4096) -> tuple[list[str], int]:
+    """
+    Reads the operator row by seeking backwards from the end of the file.
+    Returns the operators and the byte offset where that row starts.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while True:
+            start = max(end - block_size, 0)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            stripped = tail.rstrip(b"\n")
+            if (newline := stripped.rfind(b"\n")) != -1 or start == 0:
+                row_start = start + newline + 1
+                operators = [chr(c) for c in stripped[newline + 1 :] if c in b"+*"]
+                return operators, row_start
+            end = start
+
+
+def solve_streaming(path) -> list[int]:
+    """
+    Same as solve, but the number rows are streamed one at a time into the
+    accumulators, so only the current line is held in memory. Products go
+    through a StreamingProduct per column, sums are a plain fold.
+    """
+    ops, operators_start = read_operators(path)
+    accumulators = [StreamingProduct() if op == "*" else 0 for op in ops]
+    with open(path, "rb") as f:
+        while f.tell() < operators_start:
+            numbers = map(int, re.findall(rb"\d+", f.readline()))
+            for i, (op, number) in enumerate(zip(ops, numbers)):
+                if op == "*":
+                    accumulators[i].push(number)
+                else:
+                    accumulators[i] = OPERATORS[op](accumulators[i], number)
+    return [
+        accumulator.result() if op == "*" else accumulator
+        for op, accumulator in zip(ops, accumulators)
+    ]
 
 
 if __name__ == "__main__":
@@ -24,3 +69,4 @@ if __name__ == "__main__":
     operators = [i for i in lines[-1] if i in "+*"]
     results = solve(problems, operators)
     print(sum(results))
+    print(sum(solve_streaming(Path(__file__).parent / "input.txt")))
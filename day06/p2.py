@@ -1,8 +1,7 @@
 from typing import Literal
 import re
-from functools import reduce
 
-OPERATORS = {"*": int.__mul__, "+": int.__add__}
+from product_tree import REDUCERS
 
 
 def solve(input_: str) -> list[int]:
@@ -24,9 +23,7 @@ def solve(input_: str) -> list[int]:
                     value *= 10
                     value += int(line[position])
             values.append(value)
-        solutions.append(
-            reduce(OPERATORS[operation], values, 0 if operation == "+" else 1)
-        )
+        solutions.append(REDUCERS[operation](values))
     return solutions
 
 
@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import prod
+
+# Below this many values a plain fold is faster (see the benchmark below).
+FOLD_BELOW = 512
+
+
+def product_tree(values: list[int], max_workers: int = 1) -> int:
+    """
+    Multiplies the values pairwise, level by level, so the two operands of
+    every multiplication have about the same size. A left fold instead
+    multiplies an ever growing product by a small number, which is quadratic
+    in the number of digits. With max_workers > 1 the values are split in
+    one slice per worker and the partial products are combined in a tree.
+    """
+    values = list(values)
+    if len(values) < FOLD_BELOW:
+        return prod(values)
+    if max_workers > 1 and len(values) >= 2 * max_workers:
+        size = -(-len(values) // max_workers)
+        chunks = [values[i : i + size] for i in range(0, len(values), size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            values = list(executor.map(product_tree, chunks))
+    return _pairwise_product(values)
+
+
+def _pairwise_product(values: list[int]) -> int:
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [a * b for a, b in zip(values[::2], values[1::2])]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+class StreamingProduct:
+    def __init__(self):
+        """
+        product_tree for values that arrive one at a time: a binary counter of
+        partial products. Two partials of the same rank (each the product of
+        2**rank values) are multiplied as soon as they meet, so the operands
+        stay balanced and there are at most log2(values) partials.
+        """
+        self.partials: list[tuple[int, int]] = []
+
+    def push(self, value: int) -> None:
+        rank = 0
+        while self.partials and self.partials[-1][0] == rank:
+            value *= self.partials.pop()[1]
+            rank += 1
+        self.partials.append((rank, value))
+
+    def result(self) -> int:
+        return _pairwise_product([value for _, value in reversed(self.partials)])
+
+
+def chunked_sum(values: list[int], chunk_size: int = 4096) -> int:
+    """
+    Adds the values a chunk at a time, so most additions are between numbers
+    of similar size and the running total is only touched once per chunk.
+    """
+    return sum(
+        sum(values[i : i + chunk_size]) for i in range(0, len(values), chunk_size)
+    )
+
+
+REDUCERS = {"*": product_tree, "+": chunked_sum}
+
+
+if __name__ == "__main__":
+    import random
+    from functools import reduce
+    from time import perf_counter
+
+    random.seed(0)
+    crossover = None
+    for n_values in [2, 8, 32, 128, 512, 2048, 8192, 32768]:
+        values = [random.randint(1, 9999) for _ in range(n_values)]
+        start = perf_counter()
+        folded = reduce(int.__mul__, values, 1)
+        fold_time = perf_counter() - start
+        start = perf_counter()
+        assert _pairwise_product(values) == folded
+        tree_time = perf_counter() - start
+        print(f"{n_values} values: fold={fold_time:2.6f}s, tree={tree_time:2.6f}s")
+        if crossover is None and tree_time < fold_time:
+            crossover = n_values
+    print(f"The product tree wins from {crossover} values.")
+
+    values = [random.randint(1, 9999) for _ in range(200_000)]
+    start = perf_counter()
+    product = product_tree(values)
+    print(f"Serial tree: elapsed {perf_counter() - start:2.4f} seconds.")
+    start = perf_counter()
+    assert product_tree(values, max_workers=4) == product
+    print(f"Parallel tree: elapsed {perf_counter() - start:2.4f} seconds.")
+
+    values = [random.randint(1, 10**50) for _ in range(1_000_000)]
+    start = perf_counter()
+    total = reduce(int.__add__, values, 0)
+    print(f"Fold sum: elapsed {perf_counter() - start:2.4f} seconds.")
+    start = perf_counter()
+    assert chunked_sum(values) == total
+    print(f"Chunked sum: elapsed {perf_counter() - start:2.4f} seconds.")
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class DenseTachyonicRays:
+    def __init__(self, input_: str):
+        """
+        Splitters as one bit-packed row per line of the manifold. Columns are
+        shifted by one so that rays leaving the manifold on either side still
+        fit in a fixed-width row.
+        """
+        lines = input_.split("\n")
+        self.max_y = len(lines)
+        self.max_x = len(lines[0])
+        self.start_x = lines[0].index("S")
+        self.width = max(len(line) for line in lines) + 2
+        buf = np.frombuffer(
+            "".join(f".{line}".ljust(self.width, ".") for line in lines).encode(),
+            dtype=np.uint8,
+        )
+        splitters = buf.reshape(len(lines), self.width) == ord("^")
+        self.rows = np.packbits(splitters, axis=1, bitorder="little")
+        self.visited_splitters = 0
+
+    def row_mask(self, y: int) -> int:
+        return int.from_bytes(self.rows[y].tobytes(), "little") if y < self.max_y else 0
+
+    def row_splitters(self, y: int) -> np.ndarray:
+        if y >= self.max_y:
+            return np.zeros(self.width, dtype=bool)
+        return np.unpackbits(self.rows[y], count=self.width, bitorder="little") == 1
+
+    def propagate_ray(self) -> None:
+        """
+        The rays of a row are the bits of one int: the rays hitting a splitter
+        are rays & splitters, and they move one bit left and one bit right.
+        """
+        rays = 1 << (self.start_x + 1)
+        for y in range(1, self.max_y):
+            if not (hit := rays & self.row_mask(y)):
+                continue
+            self.visited_splitters += hit.bit_count()
+            rays = (rays ^ hit) | (hit << 1) | (hit >> 1)
+
+    def quantum_propagate(self) -> int:
+        """
+        Timelines as a fixed-width vector of Python ints (they overflow int64
+        quickly): the timelines on a splitter are removed and added back one
+        column to the left and one to the right.
+        """
+        timelines = np.zeros(self.width, dtype=object)
+        timelines[self.start_x + 1] = 1
+        for y in range(1, self.max_y):
+            splitters = self.row_splitters(y)
+            if not splitters.any():
+                continue
+            hit = np.where(splitters, timelines, 0)
+            timelines = timelines - hit
+            timelines[:-1] += hit[1:]
+            timelines[1:] += hit[:-1]
+        return int(timelines.sum())
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from time import perf_counter
+
+    from p2 import TachyonicRays
+
+    with open(Path(__file__).parent / "input.txt", "r") as f:
+        input_ = f.read().strip()
+    dense_rays = DenseTachyonicRays(input_)
+    dense_rays.propagate_ray()
+    print(f"Total splitters hit: {dense_rays.visited_splitters}")
+    print(f"Total quantum timelines: {dense_rays.quantum_propagate()}")
+
+    import random
+
+    random.seed(0)
+    width, height = 2_000, 5_000
+    lines = ["." * (width // 2) + "S" + "." * (width - width // 2 - 1)]
+    for y in range(1, height):
+        lines.append(
+            "".join("^" if random.random() < 0.05 else "." for _ in range(width))
+            if y % 2 == 0
+            else "." * width
+        )
+    input_ = "\n".join(lines)
+
+    start = perf_counter()
+    tachyonic_rays = TachyonicRays(input_)
+    tachyonic_rays.propagate_ray()
+    timelines = tachyonic_rays.quantum_propagate()
+    print(f"Sets: elapsed {perf_counter() - start:2.4f} seconds.")
+    start = perf_counter()
+    dense_rays = DenseTachyonicRays(input_)
+    dense_rays.propagate_ray()
+    assert dense_rays.quantum_propagate() == timelines
+    print(f"Dense: elapsed {perf_counter() - start:2.4f} seconds.")
+    assert dense_rays.visited_splitters == len(tachyonic_rays.visited_splitters)
@@ -3,48 +3,61 @@ from collections import defaultdict
 
 class TachyonicRays:
     def __init__(self, input_: str):
+        """
+        Splitters are indexed as the sorted list of the rows that contain any,
+        and for each of those rows the sorted list of their columns.
+        """
         lines = input_.split("\n")
         self.max_y = len(lines)
         self.max_x = len(lines[0])
         self.start_x = lines[0].index("S")
-        self.splitters = defaultdict(set)
+        self.splitters: dict[int, list[int]] = {}
         self.visited_splitters = set()
         for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char == "^":
-                    self.splitters[y].add(x)
+            if y and (columns := [x for x, char in enumerate(line) if char == "^"]):
+                self.splitters[y] = columns
+        self.splitter_rows = sorted(self.splitters)
 
     def propagate_ray(self) -> None:
-        y = 0
+        """
+        Jumps from one splitter row to the next and only looks up the splitters
+        of that row, so rows without splitters cost nothing.
+        """
         rays_x = {self.start_x}
-        while y <= self.max_y:
-            y += 1
-            new_rays = set()
-            for ray_x in rays_x:
-                if ray_x in self.splitters[y]:
-                    new_rays.add(ray_x - 1)
-                    new_rays.add(ray_x + 1)
-                    self.visited_splitters.add((ray_x, y))
-                else:
-                    new_rays.add(ray_x)
-            rays_x = new_rays
+        for y in self.splitter_rows:
+            hits = [x for x in self.splitters[y] if x in rays_x]
+            rays_x.difference_update(hits)
+            for x in hits:
+                rays_x.add(x - 1)
+                rays_x.add(x + 1)
+                self.visited_splitters.add((x, y))
 
     def quantum_propagate(self) -> int:
         timelines = defaultdict(int)
         timelines[self.start_x] = 1
-        y = 0
-        while y <= self.max_y:
-            y += 1
-            new_timelines = defaultdict(int)
-            for x, occurrences in timelines.items():
-                if x in self.splitters[y]:
-                    new_timelines[x - 1] += occurrences
-                    new_timelines[x + 1] += occurrences
-                else:
-                    new_timelines[x] += occurrences
-            timelines = new_timelines
+        for y in self.splitter_rows:
+            hits = [(x, timelines.pop(x)) for x in self.splitters[y] if x in timelines]
+            for x, occurrences in hits:
+                timelines[x - 1] += occurrences
+                timelines[x + 1] += occurrences
         return sum(timelines.values())
 
+    def timeline_table(self, modulus: int | None = None) -> list[int]:
+        """
+        Number of timelines for every start column, in one backward pass.
+
+        Walking the splitter rows bottom up, the timelines from column x are
+        those from x - 1 plus those from x + 1 one row below when x holds a
+        splitter, and unchanged otherwise. Outside the manifold a ray never
+        splits again, hence the padding column of ones on each side.
+        """
+        timelines = [1] * (self.max_x + 2)
+        for y in reversed(self.splitter_rows):
+            updates = [(x, timelines[x] + timelines[x + 2]) for x in self.splitters[y]]
+            for x, count in updates:
+                timelines[x + 1] = count % modulus if modulus else count
+        return timelines[1:-1]
+
 
 if __name__ == "__main__":
     from pathlib import Path
@@ -54,3 +67,5 @@ if __name__ == "__main__":
     tachyonic_rays = TachyonicRays(input_)
     timelines = tachyonic_rays.quantum_propagate()
     print(f"Total quantum timelines: {timelines}")
+    table = tachyonic_rays.timeline_table()
+    print(f"Best start column: {max(range(len(table)), key=table.__getitem__)}")
@@ -1,4 +1,6 @@
 from collections import defaultdict
+from math import log
+from pathlib import Path
 import pygame
 import numpy as np
 
@@ -9,6 +11,18 @@ SCALE = 15
 FPS = 10
 MAX_VALUE = 8
 
+# Spectral colormap keypoints from Matplotlib
+# (position, R, G, B) in 0–1 range
+SPECTRAL = [
+    (0.0, 0.6196, 0.0039, 0.2588),  # dark red
+    (0.1, 0.8353, 0.2431, 0.3098),
+    (0.2, 0.9569, 0.4275, 0.2627),
+    (0.4, 0.9922, 0.6824, 0.3804),
+    (0.6, 0.9961, 0.8784, 0.5451),
+    (0.8, 0.8784, 0.9529, 0.9725),
+    (1.0, 0.5725, 0.7725, 0.8706),  # blue
+]
+
 
 def value_to_color(v, max_v):
     """
@@ -24,18 +38,7 @@ def value_to_color(v, max_v):
     r2, g2, b2 = (255, 255, 0)
 
     t = np.log(v) / np.log(max_v)
-
-    # Spectral colormap keypoints from Matplotlib
-    # (position, R, G, B) in 0–1 range
-    spectral = [
-        (0.0, 0.6196, 0.0039, 0.2588),  # dark red
-        (0.1, 0.8353, 0.2431, 0.3098),
-        (0.2, 0.9569, 0.4275, 0.2627),
-        (0.4, 0.9922, 0.6824, 0.3804),
-        (0.6, 0.9961, 0.8784, 0.5451),
-        (0.8, 0.8784, 0.9529, 0.9725),
-        (1.0, 0.5725, 0.7725, 0.8706),  # blue
-    ]
+    spectral = SPECTRAL
 
     # Find which interval t belongs to
     for i in range(len(spectral) - 1):
@@ -53,8 +56,69 @@ def value_to_color(v, max_v):
     return (0, 0, 0)
 
 
+def spectral_lut(size: int = 256) -> np.ndarray:
+    """
+    value_to_color precomputed for `size` evenly spaced t in [0, 1].
+    """
+    t = np.linspace(0, 1, size)
+    positions = [p for p, *_ in SPECTRAL]
+    channels = [np.interp(t, positions, [c[i] for c in SPECTRAL]) for i in (1, 2, 3)]
+    return (np.stack(channels, axis=1) * 255).astype(np.uint8)
+
+
+def log_values_to_colors(
+    log_values: np.ndarray, log_max: float, lut: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized value_to_color for a whole row of log(value), with -inf for 0.
+    """
+    colors = np.zeros((*log_values.shape, 3), dtype=np.uint8)
+    positive = log_values > -np.inf
+    if log_max > 0:
+        t = np.where(positive, log_values, 0) / log_max
+        index = np.clip(np.round(t * (len(lut) - 1)), 0, len(lut) - 1).astype(int)
+        colors[positive] = lut[index[positive]]
+    colors[log_values >= log_max] = (255, 255, 0)
+    return colors
+
+
+class FrameRecorder:
+    def __init__(self, width: int, ring_size: int = 4096):
+        """
+        Keeps only the last `ring_size` frames. A frame is the row that changed,
+        stored as log(timelines) per column (-inf where there are none), so
+        memory is ring_size x width floats whatever the height.
+        """
+        self.width = width
+        self.rows = np.zeros(ring_size, dtype=np.int64)
+        self.log_values = np.full((ring_size, width), -np.inf, dtype=np.float32)
+        self.n_frames = 0
+
+    def record(self, y: int, timelines: dict[int, int]) -> None:
+        slot = self.n_frames % len(self.rows)
+        self.rows[slot] = y
+        self.log_values[slot] = -np.inf
+        for x, occurrences in timelines.items():
+            if occurrences:
+                self.log_values[slot, x + 1] = log(occurrences)
+        self.n_frames += 1
+
+    def __len__(self) -> int:
+        return min(self.n_frames, len(self.rows))
+
+    @property
+    def last(self) -> np.ndarray:
+        return self.log_values[(self.n_frames - 1) % len(self.rows)]
+
+    def __iter__(self):
+        start = self.n_frames - len(self)
+        for i in range(start, self.n_frames):
+            slot = i % len(self.rows)
+            yield int(self.rows[slot]), self.log_values[slot]
+
+
 class TachyonicRays:
-    def __init__(self, input_: str):
+    def __init__(self, input_: str, ring_size: int = 4096):
         lines = input_.split("\n")
         self.max_y = len(lines)
         self.max_x = len(lines[0])
@@ -66,7 +130,8 @@ class TachyonicRays:
                 if char == "^":
                     self.splitters[y].add(x)
 
-        self.frames: list[dict[int, int]] = []
+        # Timelines can reach x = -1 and x = max_x, hence the 2 extra columns.
+        self.frames = FrameRecorder(self.max_x + 2, ring_size)
 
     def propagate_ray(self) -> None:
         y = 0
@@ -97,31 +162,57 @@ class TachyonicRays:
                 else:
                     new_timelines[x] += occurrences
             timelines = new_timelines
-            self.frames.append(timelines)
+            self.frames.record(y, timelines)
         return sum(timelines.values())
 
-    def draw(self):
-        max_value = max(self.frames[-1].values())
+    def _background(self) -> np.ndarray:
         grid = np.zeros((self.max_y + 2, self.max_x, 3), dtype=np.uint8)
         for y, xs in self.splitters.items():
             for x in xs:
                 grid[y, x] = (255, 255, 255)
+        return grid
+
+    def _colored_frames(self):
+        """
+        Yields (y, colors of row y) for the recorded frames, using one lookup
+        table for the whole animation.
+        """
+        lut = spectral_lut()
+        log_max = float(self.frames.last.max())
+        for y, log_values in self.frames:
+            yield y, log_values_to_colors(log_values[1:-1], log_max, lut)
+
+    def render(self, directory, scale: int = SCALE) -> int:
+        """
+        Headless draw: writes every frame as a PNG in `directory`, without
+        opening a display. Returns the number of frames written.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        grid = self._background()
+        n_frames = 0
+        for y, colors in self._colored_frames():
+            grid[y] = np.where(colors.any(axis=1, keepdims=True), colors, grid[y])
+            image = grid.repeat(scale, axis=0).repeat(scale, axis=1)
+            surface = pygame.surfarray.make_surface(image.swapaxes(0, 1))
+            pygame.image.save(surface, str(directory / f"frame_{n_frames:06d}.png"))
+            n_frames += 1
+        return n_frames
+
+    def draw(self):
+        grid = self._background()
 
         pygame.init()
         screen = pygame.display.set_mode((GRID_W * SCALE, GRID_H * SCALE))
         clock = pygame.time.Clock()
 
-        frame = 0
-
-        for y, frame in enumerate(self.frames, start=1):
+        for y, colors in self._colored_frames():
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return
 
-            for x, rays in frame.items():
-                color = value_to_color(rays, max_value)
-                grid[y, x] = color
+            grid[y] = np.where(colors.any(axis=1, keepdims=True), colors, grid[y])
 
             surface = pygame.surfarray.make_surface(grid.swapaxes(0, 1))
             if SCALE != 1:
@@ -143,11 +234,15 @@ class TachyonicRays:
 
 
 if __name__ == "__main__":
-    from pathlib import Path
+    import sys
 
     with open(Path(__file__).parent / "input.txt", "r") as f:
         input_ = f.read().strip()
     tachyonic_rays = TachyonicRays(input_)
     timelines = tachyonic_rays.quantum_propagate()
     print(f"Total quantum timelines: {timelines}")
-    tachyonic_rays.draw()
+    if "--headless" in sys.argv:
+        n_frames = tachyonic_rays.render(Path(__file__).parent / "frames")
+        print(f"Wrote {n_frames} frames.")
+    else:
+        tachyonic_rays.draw()
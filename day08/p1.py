@@ -1,5 +1,8 @@
+from collections import defaultdict
+from collections.abc import Iterator
 from heapq import heappop, heappush, nsmallest
-from itertools import combinations
+from itertools import combinations, islice, product
+from math import pi
 
 Position = tuple[int, int, int]
 
@@ -22,18 +25,148 @@ def sort_pairs(boxes: list[Position], max_connections: int = 1000):
     )
 
 
+# Half of the 27 neighbouring cells (plus the cell itself): every pair of
+# adjacent cells is visited once.
+HALF_NEIGHBORHOOD = [
+    offset for offset in product((-1, 0, 1), repeat=3) if offset >= (0, 0, 0)
+]
+
+
+def _pairs_within(
+    boxes: list[Position], radius: float
+) -> Iterator[tuple[int, tuple[Position, Position]]]:
+    """
+    The pairs not further apart than `radius`, from a uniform grid of cells
+    `radius` wide: they are in the same cell or in two adjacent cells. Pairs
+    keep the order of `boxes`, as in combinations.
+    """
+    cells = defaultdict(list)
+    for i, box in enumerate(boxes):
+        cells[tuple(int(c // radius) for c in box)].append(i)
+    max_distance = radius**2
+    for (cx, cy, cz), members in cells.items():
+        for dx, dy, dz in HALF_NEIGHBORHOOD:
+            if (dx, dy, dz) == (0, 0, 0):
+                candidates = combinations(members, 2)
+            elif (other := cells.get((cx + dx, cy + dy, cz + dz))) is not None:
+                candidates = product(members, other)
+            else:
+                continue
+            for i, j in candidates:
+                if (d := distance(boxes[i], boxes[j])) <= max_distance:
+                    i, j = min(i, j), max(i, j)
+                    yield d, (boxes[i], boxes[j])
+
+
+def _shell(
+    boxes: list[Position], radius: float, inner: float
+) -> Iterator[tuple[int, tuple[Position, Position]]]:
+    return (pair for pair in _pairs_within(boxes, radius) if pair[0] > inner)
+
+
+def iter_closest_pairs(
+    boxes: list[Position], batch_size: int | None = None
+) -> Iterator[tuple[int, tuple[Position, Position]]]:
+    """
+    All the (distance, (p1, p2)) of sort_pairs_, streamed in increasing
+    distance order without enumerating all the pairs.
+
+    The pairs come in shells between the previous radius and the next one.
+    The first radius is a guess for uniformly spread boxes, then the radius
+    doubles. Before a shell is built its pairs are counted, giving up past
+    the limit: 4 * `batch_size`, or the pairs yielded so far if more. While
+    the shell is too big the radius is halved towards the previous one, so
+    outliers and clusters only cost counting passes. Memory is the grid plus
+    one shell, unless more pairs than the limit share the same distance.
+    """
+    if len(boxes) < 2:
+        return
+    batch_size = batch_size or len(boxes)
+    extents = [max(max(axis) - min(axis), 1) for axis in zip(*boxes)]
+    volume = extents[0] * extents[1] * extents[2]
+    radius = (3 * batch_size * volume / (2 * pi * len(boxes) ** 2)) ** (1 / 3)
+    radius = max(radius, 1.0)
+    max_distance = sum(e**2 for e in extents)
+    inner, n_yielded = -1, 0
+    while inner < max_distance:
+        max_shell = max(4 * batch_size, n_yielded)
+        previous = max(inner, 0) ** 0.5
+        while (previous + radius) ** 2 / 4 >= max(inner + 1, 1):
+            shell = _shell(boxes, radius, inner)
+            if sum(1 for _ in islice(shell, max_shell + 1)) <= max_shell:
+                break
+            radius = (previous + radius) / 2
+        shell = sorted(_shell(boxes, radius, inner))
+        yield from shell
+        n_yielded += len(shell)
+        inner = radius**2
+        radius *= 2
+
+
+def closest_pairs(boxes: list[Position], max_connections: int = 1000):
+    """
+    sort_pairs through the spatial index: memory grows with the number of
+    boxes and connections instead of the number of pairs.
+    """
+    return list(islice(iter_closest_pairs(boxes, max_connections), max_connections))
+
+
+class DisjointSet:
+    def __init__(self, n: int):
+        """
+        Union-find over the ids 0..n-1, with path compression and union by size.
+        """
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.n_sets = n
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int) -> int:
+        """
+        Merges the sets of i and j and returns the size of the merged set.
+        """
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return self.size[i]
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+        self.n_sets -= 1
+        return self.size[i]
+
+    def sizes(self) -> list[int]:
+        """
+        Sizes of all the sets, largest first.
+        """
+        return sorted(
+            (self.size[i] for i, parent in enumerate(self.parent) if i == parent),
+            reverse=True,
+        )
+
+
 def solve(boxes: list[Position], max_connections: int = 1000) -> list[set[Position]]:
-    distance_heap = sort_pairs(boxes, max_connections=max_connections)
-    connections: dict[Position, set[Position]] = {b: {b} for b in boxes}
+    distance_heap = closest_pairs(boxes, max_connections=max_connections)
+    ids = {b: i for i, b in enumerate(boxes)}
+    circuits = DisjointSet(len(boxes))
     for _ in range(max_connections):
         _, (b1, b2) = heappop(distance_heap)
-        merged_circuit = connections[b1].union(connections[b2])
-        for b in merged_circuit:
-            connections[b] = merged_circuit
-    unique_circuits = set()
-    for _, circuit in connections.items():
-        unique_circuits.add(tuple(sorted(circuit)))
-    return sorted(unique_circuits, key=len, reverse=True)
+        circuits.union(ids[b1], ids[b2])
+    unique_circuits = defaultdict(list)
+    for b, i in ids.items():
+        unique_circuits[circuits.find(i)].append(b)
+    return sorted(
+        (tuple(sorted(circuit)) for circuit in unique_circuits.values()),
+        key=len,
+        reverse=True,
+    )
 
 
 if __name__ == "__main__":
@@ -47,3 +180,34 @@ if __name__ == "__main__":
     solution = reduce(int.__mul__, [len(c) for c in circuits[:3]], 1)
     print([len(c) for c in circuits[:3]])
     print(f"The solution is (hopefully) = {solution}")
+
+    import random
+    from time import perf_counter
+
+    random.seed(0)
+    for n_boxes in [1_000, 10_000, 100_000]:
+        boxes = list(
+            {
+                tuple(random.randint(0, 100_000) for _ in range(3))
+                for _ in range(n_boxes)
+            }
+        )
+        start = perf_counter()
+        pairs = closest_pairs(boxes, 1000)
+        print(f"Grid, {n_boxes} boxes: elapsed {perf_counter() - start:2.4f} s.")
+        if n_boxes > 1_000:
+            # Quadratic: already over a minute at 5k boxes.
+            continue
+        start = perf_counter()
+        assert sort_pairs(boxes, 1000) == pairs
+        print(f"All pairs, {n_boxes} boxes: elapsed {perf_counter() - start:2.4f} s.")
+
+    # A dense cluster plus one far away box: the first radius, guessed from
+    # the bounding box, covers the whole cluster and has to shrink.
+    boxes = list(
+        {tuple(random.randint(0, 1_000) for _ in range(3)) for _ in range(1_000)}
+    ) + [(1_000_000, 1_000_000, 1_000_000)]
+    start = perf_counter()
+    pairs = closest_pairs(boxes, 1000)
+    print(f"Grid, cluster and outlier: elapsed {perf_counter() - start:2.4f} s.")
+    assert sort_pairs(boxes, 1000) == pairs
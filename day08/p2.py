@@ -1,6 +1,8 @@
-from heapq import heappop, heappush
+from heapq import heappush
 from itertools import combinations
 
+from p1 import DisjointSet, iter_closest_pairs
+
 Position = tuple[int, int, int]
 
 
@@ -16,15 +18,11 @@ def sort_pairs(boxes: list[Position]):
 
 
 def solve(boxes: list[Position]) -> tuple[Position, Position]:
-    distance_heap = sort_pairs(boxes)
-    connections: dict[Position, set[Position]] = {b: {b} for b in boxes}
-    while True:
-        _, (b1, b2) = heappop(distance_heap)
-        merged_circuit = connections[b1].union(connections[b2])
-        if len(merged_circuit) == len(boxes):
+    ids = {b: i for i, b in enumerate(boxes)}
+    circuits = DisjointSet(len(boxes))
+    for _, (b1, b2) in iter_closest_pairs(boxes):
+        if circuits.union(ids[b1], ids[b2]) == len(boxes):
             return b1, b2
-        for b in merged_circuit:
-            connections[b] = merged_circuit
 
 
 if __name__ == "__main__":
@@ -36,3 +34,35 @@ if __name__ == "__main__":
     b1, b2 = solve(boxes)
     print(b1, b2)
     print(f"The solution is (hopefully) = {b1[0] * b2[0]}")
+
+    import random
+    from time import perf_counter
+
+    random.seed(0)
+    for n_boxes in [10_000, 100_000]:
+        pairs = []
+        circuits = DisjointSet(n_boxes)
+        while circuits.n_sets > 1:
+            i, j = random.randrange(n_boxes), random.randrange(n_boxes)
+            circuits.union(i, j)
+            pairs.append((i, j))
+
+        start = perf_counter()
+        circuits = DisjointSet(n_boxes)
+        for i, j in pairs:
+            if circuits.union(i, j) == n_boxes:
+                break
+        print(f"Union-find, {n_boxes} boxes: elapsed {perf_counter() - start:2.4f} s.")
+        if n_boxes > 10_000:
+            # Quadratic: it does not finish in minutes at 100k boxes.
+            continue
+
+        start = perf_counter()
+        connections = {b: {b} for b in range(n_boxes)}
+        for i, j in pairs:
+            merged_circuit = connections[i].union(connections[j])
+            if len(merged_circuit) == n_boxes:
+                break
+            for b in merged_circuit:
+                connections[b] = merged_circuit
+        print(f"Set merging, {n_boxes} boxes: elapsed {perf_counter() - start:2.4f} s.")